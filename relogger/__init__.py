@@ -2,4 +2,5 @@ __version__ = '1.0.2'
 
 from syslog import Syslog
 from config_parser import RLConfig
-from relogger import RLServer
\ No newline at end of file
+from relogger import RLServer
+from profiler import StageTimer, SamplingProfiler
\ No newline at end of file
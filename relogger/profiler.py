@@ -0,0 +1,142 @@
+"""
+Profiling utilities for relogger.
+
+Two facilities are provided to diagnose a running relay:
+
+* StageTimer accumulates wall-clock time spent in each pipeline stage
+  (receive, queue wait, send_packet, file write). RLServer only calls it
+  when timing is enabled, so a disabled timer costs a single None check.
+
+* SamplingProfiler periodically samples the stacks of all threads via
+  sys._current_frames() and dumps them in the collapsed-stack format
+  understood by flamegraph.pl and speedscope. It can be started and
+  stopped at any time, e.g. from a signal handler.
+
+Quick example:
+    timer = StageTimer()
+    server = RLServer(rlconfig.flowtable, timer=timer)
+    profiler = SamplingProfiler()
+    profiler.start()
+    ...
+    profiler.stop()
+    profiler.dump('relogger.prof')
+    timer.dump(sys.stderr)
+
+"""
+import sys
+import time
+import threading
+
+
+class StageTimer(object):
+    """ Thread-safe accumulator of per-stage elapsed time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def add(self, stage, elapsed):
+        """ record one observation of `elapsed` seconds for `stage`
+        """
+        with self._lock:
+            stat = self._stats.get(stage)
+            if stat is None:
+                self._stats[stage] = [1, elapsed, elapsed]
+            else:
+                stat[0] += 1
+                stat[1] += elapsed
+                if elapsed > stat[2]:
+                    stat[2] = elapsed
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def stats(self):
+        """ get a dict of stage -> (count, total, max) in seconds
+        """
+        with self._lock:
+            return dict((k, tuple(v)) for k, v in self._stats.items())
+
+    def dump(self, fp):
+        """ write a human readable summary to a file object
+        """
+        fp.write('%-16s %10s %12s %12s %12s\n' %
+                 ('stage', 'count', 'total(s)', 'avg(us)', 'max(us)'))
+        for stage, (count, total, maxv) in sorted(self.stats().items()):
+            fp.write('%-16s %10d %12.3f %12.1f %12.1f\n' %
+                     (stage, count, total, total / count * 1e6, maxv * 1e6))
+        fp.flush()
+
+
+class SamplingProfiler(object):
+    """ Statistical profiler sampling the stacks of all running threads.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self._samples = {}
+        self._thread = None
+        self._stopping = threading.Event()
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        """ start a sampling session, discarding previous samples
+        """
+        if self.running:
+            return
+        self._samples = {}
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._sample_forever)
+        self._thread.setDaemon(True)
+        self._thread.start()
+
+    def stop(self):
+        """ stop the current sampling session
+        """
+        if not self.running:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+
+    def toggle(self):
+        """ start a session if idle or stop it if running;
+        return True if a session has been started.
+        """
+        if self.running:
+            self.stop()
+            return False
+        self.start()
+        return True
+
+    def _sample_forever(self):
+        me = threading.current_thread().ident
+        samples = self._samples
+        while not self._stopping.is_set():
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append('%s (%s:%d)' % (code.co_name,
+                        code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                key = ';'.join(reversed(stack))
+                samples[key] = samples.get(key, 0) + 1
+            time.sleep(self.interval)
+
+    def dump(self, filename):
+        """ write collected samples in collapsed-stack format; safe to
+        call while a session is running, the samples taken so far are
+        written.
+        """
+        samples = dict(self._samples)
+        with open(filename, 'w') as fp:
+            for stack, count in sorted(samples.items()):
+                fp.write('%s %d\n' % (stack, count))
@@ -1,17 +1,45 @@
 """
 Relogger server to read UDP logs from multiple sources.
 """
+import time
 import threading
 import SocketServer
 from Queue import Queue
 
 from syslog import Syslog
 
+class TimedUDPServer(SocketServer.UDPServer):
+    """ UDPServer recording the `receive` stage of each datagram, from
+    the moment it is ready on the socket (before recvfrom) until the
+    handler enqueues it and stores that time in `queued`.
+    """
+
+    def __init__(self, server_address, RequestHandlerClass, timer):
+        SocketServer.UDPServer.__init__(self, server_address, RequestHandlerClass)
+        self.timer = timer
+        self.arrival = None
+        self.queued = None
+
+    def get_request(self):
+        self.arrival = time.time()
+        return SocketServer.UDPServer.get_request(self)
+
+    def process_request(self, request, client_address):
+        SocketServer.UDPServer.process_request(self, request, client_address)
+        self.timer.add('receive', self.queued - self.arrival)
+
 class RLServer(object):
 
-    def __init__(self, flowtable):
+    def __init__(self, flowtable, timer=None):
+        """ `timer` is an optional profiler.StageTimer to collect the
+        time spent in each stage: receive (socket read),
+        queue_wait (from enqueue to consumer pickup),
+        send_packet and file_write. Timing is skipped entirely when it
+        is None.
+        """
         self.flowtable = flowtable
         self.message_queue = Queue()
+        self.timer = timer
 
     @property
     def flowtable(self):
@@ -34,13 +62,20 @@ class RLServer(object):
     	""" utility function to read socket and send to destinations
     	"""
         mqueue = self.message_queue
+        timer = self.timer
+        source = '%s:%d' % (host, port)
 
         class UDPHandler(SocketServer.BaseRequestHandler):
             def handle(self):
                 data = self.request[0].strip()
-                mqueue.put(('%s:%d' % (host, port), data))
+                queued = None if timer is None else time.time()
+                mqueue.put((source, data, queued))
+                self.server.queued = queued
 
-        server = SocketServer.UDPServer((host, port), UDPHandler)
+        if timer is None:
+            server = SocketServer.UDPServer((host, port), UDPHandler)
+        else:
+            server = TimedUDPServer((host, port), UDPHandler, timer)
         server.serve_forever()
 
     def _serve_file(self, filename, count):
@@ -48,21 +83,38 @@ class RLServer(object):
     	"""
         for line in open(filename.replace('file://', ''), 'rb'):
             data = line.strip(' \r\n')
-            self.message_queue.put((filename, data))
+            self.message_queue.put((filename, data,
+                None if self.timer is None else time.time()))
 
     def _message_consumer(self):
         while True:
-            source, data = self.message_queue.get()
+            source, data, queued = self.message_queue.get()
             logger, ofiles = self.flowtable[source]
-            # sending message
-            if logger.host_number > 0:
-                logger.send_packet(data)
-            if len(ofiles) > 0:
-                for f in ofiles:
-                    f.write(data + '\n')
-                    f.flush()
+            self._deliver(logger, ofiles, data, queued)
             self.message_queue.task_done()
 
+    def _deliver(self, logger, ofiles, data, queued):
+        """ send data to hosts and files, recording the time of each
+        stage when timing is enabled
+        """
+        timer = self.timer
+        if timer is not None:
+            start = time.time()
+            timer.add('queue_wait', start - queued)
+        # sending message
+        if logger.host_number() > 0:
+            logger.send_packet(data)
+            if timer is not None:
+                end = time.time()
+                timer.add('send_packet', end - start)
+                start = end
+        if len(ofiles) > 0:
+            for f in ofiles:
+                f.write(data + '\n')
+                f.flush()
+            if timer is not None:
+                timer.add('file_write', time.time() - start)
+
     def start(self):
     	"""
     	A quick example:
@@ -35,6 +35,12 @@ import socket
 import sys
 import time
 
+def format_timestamp(localtime):
+    """Format a struct_time as the RFC 3164 'Mmm DD HH:MM:SS' timestamp,
+    with days of the month below 10 padded by a space."""
+    day = localtime.tm_mday
+    return time.strftime("%%b %2d %%H:%%M:%%S" % day, localtime)
+
 class Facility:
     """Syslog facilities"""
     KERN, USER, MAIL, DAEMON, AUTH, SYSLOG, \
@@ -130,12 +136,7 @@ class HEADER(object):
         self._timestamp = value
 
     def _calculate_current_timestamp(self):
-        localtime = time.localtime()
-        day = time.strftime("%d", localtime)
-        if day[0] == "0":
-            day = " " + day[1:]
-        value = time.strftime("%b %%s %H:%M:%S", localtime)
-        return value % day
+        return format_timestamp(time.localtime())
 
     def _timestamp_is_valid(self, value):
         if value is None:
@@ -272,20 +273,35 @@ class Packet(object):
 class Syslog(object):
     """Send log messages to syslog servers.
 
-    The Syslog class provides two different methods for sending log
+    The Syslog class provides three different methods for sending log
     messages. The first approach (the L{log} method) is suitable for
-    creating new log messages from within a normal application. The
-    second (the L{send_packet} method) is designed for use in
+    creating new log messages from within a normal application, and
+    L{log_many} does the same for a batch of messages in one call. The
+    third (the L{send_packet} method) is designed for use in
     circumstances where you need full control over the contents of
     the syslog packet.
 
+    The hostname and tag used by L{log} are determined once when the
+    object is created, and the timestamp is formatted at most once per
+    second, so that applications can log at high rates.
+
     """
 
     PORT = 514
 
-    def __init__(self):
+    def __init__(self, hostname=None, tag=None):
+        """Initialise the object, optionally specifying hostname and tag.
+
+        They default to the hostname of the local computer and the
+        running program's name, as for L{HEADER} and L{MSG}.
+
+        """
         self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self._hostnames = {}
+        self._hostname = HEADER(hostname=hostname).hostname
+        self._tag = MSG(tag=tag).tag
+        self._prefixes = {}
+        self._timestamp = (None, None)
 
     def add_host(self, hostname):
         """Add hostname to the list of hosts that will receive packets.
@@ -294,7 +310,11 @@ class Syslog(object):
         cannot be resolved calls to L{log} or L{send_packet} will take
         a long time to return.
         """
-        self._hostnames[hostname] = 1
+        host = hostname
+        port = self.PORT
+        if ':' in hostname:
+            host, port = hostname.split(':')
+        self._hostnames[hostname] = (host, int(port))
 
     def remove_host(self, hostname):
         """Remove hostname from the list of hosts that will receive packets."""
@@ -304,12 +324,42 @@ class Syslog(object):
         return len(self._hostnames)
 
     def _send_packet_to_hosts(self, packet):
-        for hostname in self._hostnames:
-            host = hostname
-            port = self.PORT
-            if ':' in hostname:
-                host, port = hostname.split(':')
-            self._sock.sendto(str(packet), (host, int(port)))
+        self._send_to_hosts(str(packet))
+
+    def _send_to_hosts(self, data):
+        sendto = self._sock.sendto
+        for address in self._hostnames.values():
+            sendto(data, address)
+
+    def _current_timestamp(self):
+        """Return the HEADER timestamp, reformatted once per second."""
+        now = int(time.time())
+        second, value = self._timestamp
+        if second != now:
+            value = format_timestamp(time.localtime(now))
+            self._timestamp = (now, value)
+        return value
+
+    def _prefix(self, facility, level, pid):
+        """Return the cached parts of a packet around its timestamp: the
+        '<PRI>' string and the ' hostname tag[pid]' string, which already
+        holds the leading space, the hostname and the MSG tag."""
+        pid = os.getpid() if pid else None
+        key = (facility, level, pid)
+        prefix = self._prefixes.get(key)
+        if prefix is None:
+            tag = self._tag
+            if pid is not None:
+                tag += "[%s]" % pid
+            prefix = ("%s" % PRI(facility, level),
+                      " %s %s" % (self._hostname, tag))
+            self._prefixes[key] = prefix
+        return prefix
+
+    def _format(self, pri, tag, timestamp, text):
+        if text and text[0].isalnum():
+            text = ": " + text
+        return (pri + timestamp + tag + text)[:Packet.MAX_LEN]
 
     def log(self, facility, level, text, pid=False):
         """Send the message text to all registered hosts.
@@ -332,14 +382,28 @@ class Syslog(object):
         colon.
 
         """
-        pri = PRI(facility, level)
-        header = HEADER()
-        if pid:
-            msg = MSG(content=text, pid=os.getpid())
-        else:
-            msg = MSG(content=text)
-        packet = Packet(pri, header, msg)
-        self._send_packet_to_hosts(packet)
+        pri, tag = self._prefix(facility, level, pid)
+        data = self._format(pri, tag, self._current_timestamp(), text)
+        self._send_to_hosts(data)
+
+    def log_many(self, facility, level, texts, pid=False):
+        """Send each message of the iterable texts to all registered hosts.
+
+        The packets are built as for L{log}, sharing the facility, level
+        and timestamp, and one datagram is sent per message::
+
+            logger.log_many(Facility.USER, Level.INFO, ["Hello", "World"])
+
+        """
+        pri, tag = self._prefix(facility, level, pid)
+        timestamp = self._current_timestamp()
+        fmt = self._format
+        sendto = self._sock.sendto
+        addresses = list(self._hostnames.values())
+        for text in texts:
+            data = fmt(pri, tag, timestamp, text)
+            for address in addresses:
+                sendto(data, address)
 
     def send_packet(self, packet):
         """Send a L{Packet} object to all registered hosts.